@@ -13,14 +13,22 @@ def main():
     parser.add_argument("--dir", default=".", help="检测目标目录（默认当前目录）")
     parser.add_argument("--recursive", action="store_true", help="递归检测子目录")
     parser.add_argument("--report", help="将检测结果保存到指定文件（可选）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用视频探测结果缓存")
+    parser.add_argument("--io-parallel", action="store_true", help="使用线程池并行检测（适用于机械硬盘、网络存储等I/O受限场景）")
+    parser.add_argument("--deep-video", action="store_true", help="深度检测视频：读取全部帧（默认只解码首帧与末尾帧）")
+    parser.add_argument("--strict", action="store_true", help="严格检测图片：总是解析图片数据（默认文件头/尾校验通过即视为正常，不会检出文件中部的损坏数据）")
     args = parser.parse_args()
     
     try:
         # 创建并运行检测工具
         checker = MediaIntegrityChecker(
-            directory=args.dir,
+            path=args.dir,
             recursive=args.recursive,
-            report_file=args.report
+            report_file=args.report,
+            use_cache=not args.no_cache,
+            io_parallel=args.io_parallel,
+            deep_video=args.deep_video,
+            strict=args.strict
         )
         checker.run()
     except ValueError as e:
@@ -1,9 +1,655 @@
 import os
+import sys
 import argparse
-from typing import List, Tuple, Dict, Optional
-from PIL import Image
+from typing import List, Tuple, Dict, Optional, Iterator, Iterable, Callable, NamedTuple
+from PIL import Image, ImageFile, UnidentifiedImageError
 import cv2
 import subprocess
+import json
+from itertools import islice
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import queue
+import threading
+import shutil
+import unicodedata
+import multiprocessing
+import time
+
+# 截断的图片必须报错，而不是以灰色填充缺失部分后静默加载
+ImageFile.LOAD_TRUNCATED_IMAGES = False
+
+# 图片损坏时PIL抛出的异常（畸形GIF还会抛出 EOFError/IndexError），其余异常视为程序错误不予吞掉
+_IMAGE_ERRORS = (UnidentifiedImageError, OSError, SyntaxError, ValueError, EOFError, IndexError,
+                 Image.DecompressionBombError)
+
+# 图片正常时的检测信息
+_OK_IMG = "图片正常"
+
+# 可选依赖：安装PyAV后在进程内读取视频元数据并解码，无需启动ffprobe子进程
+try:
+    import av
+except ImportError:
+    av = None
+
+# 检测函数: (文件路径[, 附加参数]) -> (是否正常, 检测信息)；附加参数对图片为小写后缀，对视频为预探测元数据
+CheckHandler = Callable[..., Tuple[bool, str]]
+
+# 媒体文件: (绝对路径, 相对路径, 小写后缀)
+MediaFile = Tuple[str, str, str]
+
+# 检测任务: (序号, 文件路径, 相对路径, 文件类型, 检测函数)
+CheckTask = Tuple[int, str, str, str, CheckHandler]
+
+
+class CheckResult(NamedTuple):
+    """单个文件的检测结果（元组存储，无实例字典开销）"""
+    path: str
+    file_type: str
+    ok: bool
+    message: str
+    
+    @property
+    def status(self) -> str:
+        """状态文本（按需生成，不随结果存储）"""
+        return "✅ 正常" if self.ok else "❌ 损坏"
+
+
+# 每批并发启动的ffprobe进程数
+FFPROBE_BATCH_SIZE = 32
+
+# ffprobe进程的等待超时（秒，同批并发启动的进程共用），超时后仅依据OpenCV检测结果
+FFPROBE_TIMEOUT = 30
+
+# 扫描线程与检测端之间的队列长度上限
+SCAN_QUEUE_SIZE = 1024
+
+# 扫描结束标记
+_SCAN_DONE = object()
+
+# 检测结果每批写入标准输出的文件数
+OUTPUT_BATCH_SIZE = 64
+
+# 报告开头的汇总信息行数（控制台始终显示）
+REPORT_SUMMARY_LINES = 8
+
+
+def resolve_parallelism(io_bound: bool = False) -> int:
+    """
+    获取并行检测的工作进程/线程数
+    可通过环境变量 MEDIA_CHECKER_PARALLELISM 覆盖，默认进程数为CPU核心数，I/O并行（线程）模式为CPU核心数的4倍（最多32）
+    :param io_bound: 是否为I/O并行（线程）模式
+    """
+    value = os.environ.get("MEDIA_CHECKER_PARALLELISM")
+    if value:
+        try:
+            return max(1, int(value))
+        except ValueError:
+            raise ValueError(f"环境变量 MEDIA_CHECKER_PARALLELISM 的值 '{value}' 不是有效整数")
+    if io_bound:
+        return min(32, (os.cpu_count() or 1) * 4)
+    return os.cpu_count() or 1
+
+
+def _error_detail(error: BaseException) -> str:
+    """
+    取得异常的说明文本（不调用 str(e)，避免参数无法转为字符串时再次出错）
+    :param error: 异常
+    :return: 首个参数为字符串时返回该参数，OSError 返回系统错误信息，否则返回异常类型名
+    """
+    if error.args and isinstance(error.args[0], str):
+        return error.args[0]
+    if isinstance(error, OSError) and isinstance(error.strerror, str):
+        return error.strerror
+    return type(error).__name__
+
+
+def _quick_header_check(file_path: str, file_ext: str) -> bool:
+    """
+    快速校验图片的文件头签名与文件尾标记（仅读取开头64字节和末尾16字节）
+    :param file_path: 图片文件路径
+    :param file_ext: 小写文件后缀
+    :return: 是否通过；未通过不代表已损坏（如文件尾附加了其他数据），需再由PIL检测
+    """
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(64)
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - 16))
+            tail = f.read()
+    except OSError:
+        return False
+
+    if file_ext in ('.jpg', '.jpeg'):
+        # SOI 标记开头，EOI 标记结尾（允许其后的零字节填充）
+        return head.startswith(b"\xff\xd8\xff") and tail.rstrip(b"\x00").endswith(b"\xff\xd9")
+    if file_ext == '.png':
+        # PNG 签名开头，IEND 块（含CRC）结尾
+        return head.startswith(b"\x89PNG\r\n\x1a\n") and tail.endswith(b"IEND\xaeB`\x82")
+    if file_ext == '.gif':
+        # GIF87a/GIF89a 开头，';' 结尾
+        return head[:6] in (b"GIF87a", b"GIF89a") and tail.endswith(b";")
+    if file_ext == '.bmp':
+        # BM 开头，文件头记录的大小与实际大小一致
+        return head.startswith(b"BM") and len(head) >= 6 and int.from_bytes(head[2:6], "little") == size
+    return False
+
+
+def check_image_integrity(file_path: str, file_ext: Optional[str] = None, strict: bool = False) -> Tuple[bool, str]:
+    """
+    检测图片文件完整性
+    :param file_path: 图片文件路径
+    :param file_ext: 小写文件后缀（可选，扫描时已取得，缺省时由路径解析）
+    :param strict: 是否严格检测（跳过文件头/尾快速校验，总是由PIL解析数据）
+    :return: (是否正常, 检测信息)
+    """
+    if file_ext is None:
+        file_ext = os.path.splitext(file_path)[1].lower()
+    # 文件头签名与文件尾标记均正常时直接判定正常，避免读取整个文件
+    if not strict and _quick_header_check(file_path, file_ext):
+        return True, _OK_IMG
+
+    try:
+        # 尝试打开图片并验证基本属性
+        with Image.open(file_path) as img:
+            # 验证图片尺寸（排除无效图片）
+            if img.width <= 0 or img.height <= 0:
+                return False, f"无效图片尺寸: {img.width}x{img.height}"
+
+            # 验证图片格式一致性（verify() 之后图片对象不可再用，需提前检查）
+            if file_ext == '.jpg' and img.format != 'JPEG':
+                return False, f"格式不匹配: 文件后缀为{file_ext}，实际格式为{img.format}"
+            if file_ext == '.png' and img.format != 'PNG':
+                return False, f"格式不匹配: 文件后缀为{file_ext}，实际格式为{img.format}"
+
+            # 检测损坏数据：PNG 的 verify() 逐块校验CRC而无需解码像素；
+            # 其余格式的 verify() 不读取图像数据（截断的JPEG也能通过），仍需解码
+            if img.format == 'PNG':
+                img.verify()
+            else:
+                if img.format == 'JPEG':
+                    # 让libjpeg在DCT域按1/8缩放解码：熵解码仍完整读取整个文件（截断检测不受影响），
+                    # 但IDCT与像素内存开销大幅降低
+                    img.draft(img.mode, (max(1, img.width // 8), max(1, img.height // 8)))
+                img.load()
+                # 动态GIF还需确认最后一帧可读取
+                if img.format == 'GIF' and getattr(img, "n_frames", 1) > 1:
+                    img.seek(img.n_frames - 1)
+                    img.load()
+
+        return True, _OK_IMG
+
+    except FileNotFoundError:
+        return False, "文件不存在"
+    except PermissionError:
+        return False, "权限不足，无法读取文件"
+    except _IMAGE_ERRORS as e:
+        return False, f"损坏或不支持的图片格式: {_error_detail(e)[:100]}"
+
+
+class ProbeCache:
+    """
+    视频探测结果缓存
+    以 (绝对路径, 文件大小, 修改时间) 为键，将 {时长, 宽, 高, 帧数} 持久化到JSON文件，文件未变化时重复扫描无需再次探测
+    """
+    
+    DEFAULT_FILE = os.path.join(os.path.expanduser("~"), ".cache", "media_integrity_checker", "ffprobe.json")
+    
+    def __init__(self, cache_file: Optional[str] = None):
+        """
+        初始化缓存并加载已有记录
+        :param cache_file: 缓存文件路径（可选，默认 ~/.cache/media_integrity_checker/ffprobe.json）
+        """
+        self.cache_file = cache_file or self.DEFAULT_FILE
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            # 缓存不存在或已损坏时从空缓存开始
+            self.entries = {}
+        if not isinstance(self.entries, dict):
+            # 内容可解析但结构不符（如顶层为列表）同样视为已损坏
+            self.entries = {}
+    
+    def get(self, file_path: str) -> Optional[Dict]:
+        """
+        查询缓存
+        :param file_path: 视频文件绝对路径
+        :return: 探测结果，文件已变化或未缓存时返回None
+        """
+        entry = self.entries.get(file_path)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        try:
+            if entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                return None
+            probe = entry["probe"]
+        except (KeyError, TypeError):
+            # 结构不符的记录视为未缓存，检测正常后会被覆盖
+            return None
+        return probe if isinstance(probe, dict) else None
+    
+    def put(self, file_path: str, probe: Dict) -> None:
+        """
+        写入缓存
+        :param file_path: 视频文件绝对路径
+        :param probe: 探测结果
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        self.entries[file_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "probe": probe}
+        self.dirty = True
+    
+    def save(self) -> None:
+        """将缓存写回磁盘（无变化时跳过）"""
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"警告：无法写入缓存文件 {self.cache_file}: {e}")
+
+
+def _parse_probe_output(stdout: str) -> Dict:
+    """
+    解析ffprobe的JSON输出
+    :param stdout: ffprobe输出
+    :return: 探测结果 {duration, width, height, frame_count}，流信息缺失的字段不包含在内
+    """
+    info = json.loads(stdout)
+    probe = {"duration": float(info["format"]["duration"])}
+    streams = info.get("streams") or []
+    if streams:
+        stream = streams[0]
+        for key, field in (("width", "width"), ("height", "height"), ("frame_count", "nb_frames")):
+            try:
+                probe[key] = int(stream[field])
+            except (KeyError, ValueError, TypeError):
+                continue
+    return probe
+
+
+def probe_videos_batch(paths: List[str]) -> Dict[str, Dict]:
+    """
+    批量探测视频元数据
+    ffprobe 单次调用只接受一个输入，因此按批并发启动ffprobe进程，重叠进程创建与探测的等待时间
+    :param paths: 视频文件路径列表
+    :return: {文件路径: 探测结果}；探测失败的文件记录为 {"error": 错误信息}，超时的文件记录为空字典（仅依据OpenCV检测），
+             未安装ffprobe时返回已探测的部分
+    """
+    probes: Dict[str, Dict] = {}
+    for start in range(0, len(paths), FFPROBE_BATCH_SIZE):
+        procs = []
+        for file_path in paths[start:start + FFPROBE_BATCH_SIZE]:
+            try:
+                procs.append((file_path, subprocess.Popen(
+                    ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+                     '-show_entries', 'format=duration:stream=width,height,nb_frames',
+                     '-print_format', 'json', file_path],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+                )))
+            except FileNotFoundError:
+                # 未安装ffprobe，由各文件检测时回退到OpenCV
+                for _, proc in procs:
+                    proc.kill()
+                    proc.communicate()
+                return probes
+        
+        # 同批进程并发运行，共用一个截止时间，避免超时逐个累加
+        deadline = time.monotonic() + FFPROBE_TIMEOUT
+        for file_path, proc in procs:
+            try:
+                stdout, _ = proc.communicate(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                probes[file_path] = {}
+                continue
+            if proc.returncode != 0:
+                error = subprocess.CalledProcessError(proc.returncode, proc.args)
+                probes[file_path] = {"error": f"ffprobe检测失败: {str(error)[:80]}"}
+                continue
+            try:
+                probes[file_path] = _parse_probe_output(stdout)
+            except (ValueError, KeyError, TypeError) as e:
+                probes[file_path] = {"error": f"ffprobe检测失败: {str(e)[:80]}"}
+    
+    return probes
+
+
+def _wait_ffprobe(proc: subprocess.Popen) -> Tuple[float, Optional[str]]:
+    """
+    等待单个ffprobe进程结束并解析时长
+    :param proc: ffprobe进程
+    :return: (时长, 错误信息)；超时时返回 (0.0, None)，由OpenCV检测结果决定
+    """
+    try:
+        stdout, _ = proc.communicate(timeout=FFPROBE_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return 0.0, None
+    
+    if proc.returncode != 0:
+        error = subprocess.CalledProcessError(proc.returncode, proc.args)
+        return 0.0, f"ffprobe检测失败: {str(error)[:80]}"
+    try:
+        duration = float(stdout.strip())
+    except ValueError as e:
+        return 0.0, f"ffprobe检测失败: {str(e)[:80]}"
+    if duration <= 0:
+        return duration, f"无效视频时长: {duration}秒"
+    return duration, None
+
+
+def _inspect_capture(cap: cv2.VideoCapture, probe: Optional[Dict]) -> Tuple[Optional[str], int, int, int]:
+    """
+    验证视频基本属性并解码首帧
+    :param cap: 已创建的 VideoCapture
+    :param probe: 预先探测或缓存的元数据（可选）
+    :return: (错误信息, 帧数, 宽, 高)，正常时错误信息为None
+    """
+    # 检查是否成功打开视频
+    if not cap.isOpened():
+        return "无法打开视频文件，可能已损坏", 0, 0, 0
+
+    # 验证视频基本属性
+    if probe and all(key in probe for key in ("frame_count", "width", "height")):
+        # 已有完整的ffprobe元数据（含缓存命中），无需再通过OpenCV读取属性
+        frame_count = probe["frame_count"]
+        width = probe["width"]
+        height = probe["height"]
+    else:
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if fps <= 0:
+            return f"无效帧率: {fps}", frame_count, width, height
+
+    if frame_count <= 0:
+        return f"无效帧数: {frame_count}", frame_count, width, height
+    if width <= 0 or height <= 0:
+        return f"无效视频尺寸: {width}x{height}", frame_count, width, height
+
+    # 首帧完整解码，确认画面数据可用
+    ret = cap.grab()
+    if ret:
+        ret, frame = cap.retrieve()
+    if not ret or frame is None:
+        return "帧0读取失败，视频可能损坏", frame_count, width, height
+
+    return None, frame_count, width, height
+
+
+def check_video_integrity_pyav(file_path: str, deep: bool = False) -> Tuple[bool, str]:
+    """
+    使用PyAV检测视频文件完整性（进程内完成元数据读取与解码，无需ffprobe/OpenCV）
+    :param file_path: 视频文件路径
+    :param deep: 是否深度检测（解码全部帧）；默认只解码首帧与末尾帧
+    :return: (是否正常, 检测信息)
+    """
+    try:
+        with av.open(file_path) as container:
+            if not container.streams.video:
+                return False, "未找到视频流，可能已损坏"
+            stream = container.streams.video[0]
+            
+            # 验证视频基本属性
+            duration = container.duration / av.time_base if container.duration else 0.0
+            frame_count = stream.frames
+            width = stream.codec_context.width
+            height = stream.codec_context.height
+            if duration <= 0:
+                return False, f"无效视频时长: {duration}秒"
+            if width <= 0 or height <= 0:
+                return False, f"无效视频尺寸: {width}x{height}"
+            if frame_count <= 0 and stream.average_rate:
+                # 部分容器（如mkv）不记录帧数，按平均帧率估算
+                frame_count = int(duration * stream.average_rate)
+            
+            # 首帧解码，确认画面数据可用
+            frames = container.decode(stream)
+            if next(frames, None) is None:
+                return False, "帧0读取失败，视频可能损坏"
+            
+            if deep:
+                decoded = 1
+                try:
+                    for _ in frames:
+                        decoded += 1
+                except av.FFmpegError:
+                    return False, f"帧{decoded}读取失败，视频可能损坏"
+                # 帧数来自容器元数据，与OpenCV路径保持一致的容差
+                if decoded <= frame_count - 5:
+                    return False, f"帧{decoded}读取失败，视频可能损坏"
+            elif stream.average_rate:
+                # 截断文件的时长按实际数据计算，而帧数来自头部元数据，二者不一致即视为损坏
+                if frame_count - duration * stream.average_rate > 5:
+                    return False, f"帧数与时长不符 (帧数: {frame_count}, 时长: {duration:.1f}秒)，视频可能损坏"
+                # 定位到倒数第5帧并解码，确认末尾数据可用
+                tail_index = max(0, frame_count - 5)
+                tail_pts = int(tail_index / stream.average_rate / stream.time_base) + (stream.start_time or 0)
+                container.seek(tail_pts, stream=stream, backward=True)
+                for frame in container.decode(stream):
+                    if frame.pts is not None and frame.pts >= tail_pts:
+                        break
+                else:
+                    return False, f"帧{tail_index}读取失败，视频可能损坏"
+
+        return True, f"视频正常 (时长: {duration:.1f}秒, 分辨率: {width}x{height}, 帧数: {frame_count})"
+    
+    except FileNotFoundError:
+        return False, "文件不存在"
+    except PermissionError:
+        return False, "权限不足，无法读取文件"
+    except Exception as e:
+        return False, f"损坏或不支持的视频格式: {str(e)[:100]}"
+
+
+def check_video_integrity(file_path: str, probe: Optional[Dict] = None, deep: bool = False) -> Tuple[bool, str]:
+    """
+    检测视频文件完整性（已安装PyAV时使用 check_video_integrity_pyav）
+    :param file_path: 视频文件路径
+    :param probe: 预先探测或缓存的元数据（可选，缺省时单独调用ffprobe）
+    :param deep: 是否深度检测（读取全部帧）；默认只解码首帧与末尾帧
+    :return: (是否正常, 检测信息)
+    """
+    if av is not None:
+        return check_video_integrity_pyav(file_path, deep)
+    
+    proc = None
+    duration = 0.0
+    if probe is None:
+        # 单独启动ffprobe检测视频元数据（需要安装ffmpeg），不等待结果，与下方OpenCV的打开和首帧解码并行进行
+        try:
+            proc = subprocess.Popen(
+                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
+                 '-of', 'default=noprint_wrappers=1:nokey=1', file_path],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except FileNotFoundError:
+            # 若无ffprobe，使用OpenCV进行基础检测
+            pass
+        except Exception as e:
+            return False, f"ffprobe检测失败: {str(e)[:80]}"
+    elif "error" in probe:
+        # 批量探测已失败，不再重复启动ffprobe
+        return False, probe["error"]
+    elif "duration" in probe:
+        # 探测超时的文件无时长，仅依据OpenCV检测
+        duration = probe["duration"]
+        if duration <= 0:
+            return False, f"无效视频时长: {duration}秒"
+
+    # 使用OpenCV检测视频帧完整性
+    cap = None
+    try:
+        cap = cv2.VideoCapture(file_path)
+        error, frame_count, width, height = _inspect_capture(cap, probe)
+        
+        # 在读取其余帧之前取回ffprobe结果，ffprobe的错误优先报告
+        if proc is not None:
+            duration, probe_error = _wait_ffprobe(proc)
+            proc = None
+            if probe_error:
+                return False, probe_error
+        if error:
+            return False, error
+        
+        if not deep:
+            # 单次定位到倒数第5帧并grab，检出截断的文件（无需顺序解码全部帧；未安装ffprobe时同样适用）
+            tail_index = max(0, frame_count - 5)
+            if tail_index > 0 and not (cap.set(cv2.CAP_PROP_POS_FRAMES, tail_index) and cap.grab()):
+                return False, f"帧{tail_index}读取失败，视频可能损坏"
+        else:
+            # 深度检测：其余帧顺序grab至文件末尾（grab仍会解码每一帧，仅省去retrieve的颜色空间转换）
+            grabbed = 1
+            while cap.grab():
+                grabbed += 1
+            # CAP_PROP_FRAME_COUNT 为估算值，与原先读取倒数第5帧的判定保持一致的容差
+            if grabbed <= frame_count - 5:
+                return False, f"帧{grabbed}读取失败，视频可能损坏"
+
+        return True, f"视频正常 (时长: {duration:.1f}秒, 分辨率: {width}x{height}, 帧数: {frame_count})"
+
+    except FileNotFoundError:
+        return False, "文件不存在"
+    except PermissionError:
+        return False, "权限不足，无法读取文件"
+    except Exception as e:
+        return False, f"损坏或不支持的视频格式: {str(e)[:100]}"
+    finally:
+        if proc is not None:
+            proc.kill()
+            proc.communicate()
+        if cap is not None:
+            cap.release()
+
+
+def _check_one(handler: CheckHandler, file_path: str, extra: object = None) -> Tuple[bool, str]:
+    """执行单个文件的检测（模块级函数，便于在子进程中执行）；附加参数为图片的小写后缀或视频的预探测元数据"""
+    if extra is None:
+        return handler(file_path)
+    return handler(file_path, extra)
+
+
+def _iter_queue_batches(scan_queue: queue.Queue, batch_size: int) -> Iterator[List[MediaFile]]:
+    """
+    从扫描队列中按批取出媒体文件：阻塞等待第一个，其余只取队列中已有的，避免等待凑满一批
+    :param scan_queue: 扫描队列（以 _SCAN_DONE 结束）
+    :param batch_size: 每批最大数量
+    :return: 媒体文件批次迭代器
+    """
+    while True:
+        item = scan_queue.get()
+        if item is _SCAN_DONE:
+            return
+        batch = [item]
+        while len(batch) < batch_size:
+            try:
+                item = scan_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _SCAN_DONE:
+                yield batch
+                return
+            batch.append(item)
+        yield batch
+
+
+def _fit_width(text: str, limit: int) -> str:
+    """
+    按终端列数截断文本，保留末尾部分
+    :param text: 文本
+    :param limit: 最大列数（东亚宽字符按两列计）
+    :return: 不超过 limit 列的文本，被截断时以 "..." 开头
+    """
+    widths = [2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in text]
+    if sum(widths) <= limit:
+        return text
+    if limit < 3:
+        return ""
+    # 从末尾向前累加各字符宽度，一次确定截断位置
+    budget = limit - 3
+    start = len(text)
+    while start > 0 and widths[start - 1] <= budget:
+        start -= 1
+        budget -= widths[start]
+    return "..." + text[start:]
+
+
+class _ResultWriter:
+    """
+    检测结果输出缓冲
+    逐文件结果先累积，每满一批再一次性写入标准输出；终端模式下批次之间显示单行刷新的进度
+    """
+    
+    def __init__(self, batch_size: int = OUTPUT_BATCH_SIZE):
+        """
+        :param batch_size: 每批写入的文件数
+        """
+        self.batch_size = batch_size
+        self.lines: List[str] = []
+        self.pending = 0
+        self.interactive = sys.stdout.isatty()
+        self.progress_shown = False
+    
+    def add(self, done: int, total: str, relative_path: str, status: str, message: str) -> None:
+        """
+        添加单个文件的检测结果
+        :param done: 已完成数量
+        :param total: 文件总数（未知时为 "?"）
+        :param relative_path: 文件相对路径
+        :param status: 状态文本
+        :param message: 检测信息
+        """
+        self.lines.append(f"[{done}/{total}] 检测: {relative_path}")
+        self.lines.append(f"     状态: {status} - {message}\n")
+        self.pending += 1
+        
+        if self.pending >= self.batch_size:
+            self.flush()
+        elif self.interactive:
+            prefix = f"[{done}/{total}] "
+            # 进度行不得超过终端宽度，否则折行后无法整行清除；宽字符占两列，从路径开头截断
+            limit = shutil.get_terminal_size().columns - 1 - len(prefix)
+            sys.stdout.write(self._clear_progress() + prefix + _fit_width(relative_path, limit))
+            sys.stdout.flush()
+            self.progress_shown = True
+    
+    def _clear_progress(self) -> str:
+        """返回清除当前进度行所需的文本"""
+        if not self.progress_shown:
+            return ""
+        self.progress_shown = False
+        # 回到行首并清除至行尾
+        return "\r\x1b[K"
+    
+    def flush(self) -> None:
+        """写出所有缓冲的结果"""
+        text = self._clear_progress()
+        if self.lines:
+            text += "\n".join(self.lines) + "\n"
+            self.lines = []
+            self.pending = 0
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
 
 class MediaIntegrityChecker:
     """媒体文件完整性检测工具类"""
@@ -11,22 +657,46 @@ class MediaIntegrityChecker:
     # 支持的媒体格式
     SUPPORTED_IMAGES = ('.jpg', '.jpeg', '.png', '.gif', '.bmp')
     SUPPORTED_VIDEOS = ('.mp4', '.avi', '.mkv', '.mov', '.flv')
+    # 后缀 -> (文件类型, 检测函数)，扫描过滤与检测分派共用
+    DISPATCH: Dict[str, Tuple[str, CheckHandler]] = {
+        **{ext: ("IMAGE", check_image_integrity) for ext in SUPPORTED_IMAGES},
+        **{ext: ("VIDEO", check_video_integrity) for ext in SUPPORTED_VIDEOS},
+    }
     
-    def __init__(self, path: str = ".", recursive: bool = False, report_file: Optional[str] = None):
+    def __init__(self, path: str = ".", recursive: bool = False, report_file: Optional[str] = None,
+                 use_cache: bool = True, io_parallel: bool = False, deep_video: bool = False,
+                 strict: bool = False):
         """
         初始化检测工具
         :param path: 检测目标目录
         :param recursive: 是否递归检测子目录
         :param report_file: 报告保存路径（可选）
+        :param use_cache: 是否使用视频探测结果缓存
+        :param io_parallel: 是否使用线程池并行检测（适用于I/O等待为主的场景，如机械硬盘、网络存储）
+        :param deep_video: 是否深度检测视频（读取全部帧，而非仅解码首帧与末尾帧）
+        :param strict: 是否严格检测图片（总是由PIL解析数据，而非仅校验文件头/尾）
         """
         self.path = os.path.abspath(path)
         self.recursive = recursive
         self.report_file = report_file
-        self.media_files: List[str] = []
-        self.results: List[Dict] = []
+        self.media_files: List[MediaFile] = []
+        self.results: List[CheckResult] = []
         self.total_count = 0
+        self.scan_finished = False
         self.ok_count = 0
         self.error_count = 0
+        self.io_parallel = io_parallel
+        self.parallelism = resolve_parallelism(io_parallel)
+        self.probe_cache = ProbeCache() if use_cache else None
+        self.deep_video = deep_video
+        self.strict = strict
+        # 按检测选项绑定检测函数参数（partial 可被子进程序列化），实例级分派表与检测方法共用
+        self.image_handler: CheckHandler = partial(check_image_integrity, strict=True) if strict else check_image_integrity
+        self.video_handler: CheckHandler = partial(check_video_integrity, deep=True) if deep_video else check_video_integrity
+        self.dispatch: Dict[str, Tuple[str, CheckHandler]] = {
+            **{ext: ("IMAGE", self.image_handler) for ext in self.SUPPORTED_IMAGES},
+            **{ext: ("VIDEO", self.video_handler) for ext in self.SUPPORTED_VIDEOS},
+        }
         self.is_directory = os.path.isdir(self.path)
         
         # 验证路径有效性
@@ -35,122 +705,65 @@ class MediaIntegrityChecker:
         if not self.is_directory:
             # 若为文件，检查是否为支持的媒体类型
             file_ext = os.path.splitext(self.path)[1].lower()
-            if file_ext not in self.SUPPORTED_IMAGES and file_ext not in self.SUPPORTED_VIDEOS:
+            if file_ext not in self.DISPATCH:
                 raise ValueError(f"文件 '{self.path}' 不是支持的媒体类型（图片/视频）")
     
     def scan_media_files(self) -> None:
         """扫描目标路径中的媒体文件（支持单个文件或目录）"""
-        if self.is_directory:
-            # 目录模式：扫描目录下的媒体文件
-            for root, _, files in os.walk(self.path):
-                for file in files:
-                    file_ext = os.path.splitext(file)[1].lower()
-                    if file_ext in self.SUPPORTED_IMAGES or file_ext in self.SUPPORTED_VIDEOS:
-                        self.media_files.append(os.path.join(root, file))
-                if not self.recursive:
-                    break  # 非递归模式只扫描当前目录
-        else:
-            # 文件模式：直接添加单个文件
-            self.media_files.append(self.path)
-        
+        self.media_files.extend(self.iter_media_files())
         self.total_count = len(self.media_files)
+        self.scan_finished = True
     
-    def check_image_integrity(self, file_path: str) -> Tuple[bool, str]:
+    def iter_media_files(self) -> Iterator[MediaFile]:
         """
-        检测图片文件完整性
-        :param file_path: 图片文件路径
-        :return: (是否正常, 检测信息)
+        逐个返回目标路径中的媒体文件（支持单个文件或目录）
+        :return: 媒体文件迭代器
         """
-        try:
-            # 尝试打开图片并验证基本属性
-            with Image.open(file_path) as img:
-                # 验证图片尺寸（排除无效图片）
-                if img.width <= 0 or img.height <= 0:
-                    return False, f"无效图片尺寸: {img.width}x{img.height}"
-                
-                # 尝试读取图片数据（检测损坏数据）
-                img.load()
-                
-                # 验证图片格式一致性
-                file_ext = os.path.splitext(file_path)[1].lower()
-                if file_ext == '.jpg' and img.format != 'JPEG':
-                    return False, f"格式不匹配: 文件后缀为{file_ext}，实际格式为{img.format}"
-                if file_ext == '.png' and img.format != 'PNG':
-                    return False, f"格式不匹配: 文件后缀为{file_ext}，实际格式为{img.format}"
-            
-            return True, "图片正常"
-        
-        except FileNotFoundError:
-            return False, "文件不存在"
-        except PermissionError:
-            return False, "权限不足，无法读取文件"
-        except Exception as e:
-            return False, f"损坏或不支持的图片格式: {str(e)[:100]}"
+        if self.is_directory:
+            # 目录模式：扫描目录下的媒体文件（扫描结果均以 self.path 为前缀，相对路径直接截取）
+            prefix_len = len(os.path.join(self.path, ""))
+            yield from self._iter_directory(self.path, prefix_len)
+        else:
+            # 文件模式：直接返回单个文件
+            yield self.path, ".", os.path.splitext(self.path)[1].lower()
     
-    def check_video_integrity(self, file_path: str) -> Tuple[bool, str]:
+    def _iter_directory(self, directory: str, prefix_len: int) -> Iterator[MediaFile]:
         """
-        检测视频文件完整性
-        :param file_path: 视频文件路径
-        :return: (是否正常, 检测信息)
+        基于 os.scandir 遍历目录，逐个返回支持的媒体文件
+        先返回当前目录下的文件，再进入子目录（与 os.walk 自顶向下的顺序一致）
+        :param directory: 目录路径
+        :param prefix_len: 检测根目录（含末尾分隔符）的长度，用于截取相对路径
+        :return: 媒体文件迭代器
         """
-        duration = 0.0
-        # 先通过ffprobe检测视频元数据（需要安装ffmpeg）
-        try:
-            result = subprocess.run(
-                ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-                 '-of', 'default=noprint_wrappers=1:nokey=1', file_path],
-                capture_output=True, text=True, check=True
-            )
-            duration = float(result.stdout.strip())
-            if duration <= 0:
-                return False, f"无效视频时长: {duration}秒"
-        except FileNotFoundError:
-            # 若无ffprobe，使用OpenCV进行基础检测
-            pass
-        except Exception as e:
-            return False, f"ffprobe检测失败: {str(e)[:80]}"
-        
-        # 使用OpenCV检测视频帧完整性
-        cap = None
+        subdirs = []
         try:
-            cap = cv2.VideoCapture(file_path)
-            
-            # 检查是否成功打开视频
-            if not cap.isOpened():
-                return False, "无法打开视频文件，可能已损坏"
-            
-            # 验证视频基本属性
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
-            if frame_count <= 0:
-                return False, f"无效帧数: {frame_count}"
-            if fps <= 0:
-                return False, f"无效帧率: {fps}"
-            if width <= 0 or height <= 0:
-                return False, f"无效视频尺寸: {width}x{height}"
-            
-            # 检测关键帧（读取前5帧和最后5帧，避免完整读取大文件）
-            test_frames = [0, min(100, frame_count//2), max(0, frame_count-5)]
-            for frame_idx in test_frames:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                if not ret or frame is None:
-                    return False, f"帧{frame_idx}读取失败，视频可能损坏"
-            
-            return True, f"视频正常 (时长: {duration:.1f}秒, 分辨率: {width}x{height}, 帧数: {frame_count})"
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # 不跟随符号链接进入目录，避免循环遍历
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive:
+                            subdirs.append(entry.path)
+                        continue
+                    # 无后缀时切片结果为单个字符，不会命中分派表
+                    name = entry.name
+                    file_ext = name[name.rfind('.'):].lower()
+                    if file_ext in self.DISPATCH:
+                        file_path = entry.path
+                        yield file_path, file_path[prefix_len:], file_ext
+        except OSError:
+            # 与 os.walk 一致：忽略无法访问的目录
+            return
         
-        except FileNotFoundError:
-            return False, "文件不存在"
-        except PermissionError:
-            return False, "权限不足，无法读取文件"
-        except Exception as e:
-            return False, f"损坏或不支持的视频格式: {str(e)[:100]}"
-        finally:
-            if cap is not None:
-                cap.release()
+        for subdir in subdirs:
+            yield from self._iter_directory(subdir, prefix_len)
+    
+    def check_image_integrity(self, file_path: str) -> Tuple[bool, str]:
+        """检测图片文件完整性（遵循 strict 选项）"""
+        return self.image_handler(file_path)
+    
+    def check_video_integrity(self, file_path: str) -> Tuple[bool, str]:
+        """检测视频文件完整性（遵循 deep_video 选项）"""
+        return self.video_handler(file_path)
     
     def run_checks(self) -> None:
         """执行所有媒体文件的完整性检测"""
@@ -160,67 +773,181 @@ class MediaIntegrityChecker:
         if not self.media_files:
             return
         
+        batches = (
+            self.media_files[start:start + FFPROBE_BATCH_SIZE]
+            for start in range(0, len(self.media_files), FFPROBE_BATCH_SIZE)
+        )
+        self._check_batches(batches, min(self.parallelism, len(self.media_files)))
+    
+    def run_checks_streaming(self) -> None:
+        """
+        边扫描边检测：后台线程扫描目录并放入有界队列，检测端按批取出检测
+        扫描与检测重叠进行，待检测路径的内存占用受队列长度限制而非文件总数
+        """
+        self.total_count = 0
+        self.scan_finished = False
+        scan_queue: queue.Queue = queue.Queue(maxsize=SCAN_QUEUE_SIZE)
+        scanner = threading.Thread(target=self._scan_into_queue, args=(scan_queue,), daemon=True)
+        scanner.start()
+        self._check_batches(_iter_queue_batches(scan_queue, FFPROBE_BATCH_SIZE), self.parallelism)
+        scanner.join()
+    
+    def _scan_into_queue(self, scan_queue: queue.Queue) -> None:
+        """
+        扫描线程：逐个放入队列（队列满时阻塞，形成背压），同时在线累计文件总数，结束时放入结束标记
+        :param scan_queue: 有界队列
+        """
+        try:
+            for media_file in self.iter_media_files():
+                scan_queue.put(media_file)
+                self.total_count += 1
+        finally:
+            self.scan_finished = True
+            scan_queue.put(_SCAN_DONE)
+    
+    def _check_batches(self, batches: Iterable[List[MediaFile]], workers: int) -> None:
+        """
+        按批检测媒体文件并汇总结果
+        :param batches: 媒体文件批次
+        :param workers: 并行工作进程/线程数
+        """
         self.results = []
         self.ok_count = 0
         
-        for idx, file_path in enumerate(self.media_files, 1):
-            relative_path = os.path.relpath(file_path, self.path)
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            print(f"[{idx}/{self.total_count}] 检测: {relative_path}")
-            
-            if file_ext in self.SUPPORTED_IMAGES:
-                is_ok, message = self.check_image_integrity(file_path)
-                file_type = "IMAGE"
-            else:
-                is_ok, message = self.check_video_integrity(file_path)
-                file_type = "VIDEO"
+        fresh_probes: Dict[str, Dict] = {}
+        writer = _ResultWriter()
+        indexed_results = []
+        outcomes = self._iter_outcomes(self._iter_tasks(batches, fresh_probes), workers)
+        
+        # 循环内频繁访问的属性与方法绑定为局部变量，减少逐文件的属性查找
+        # （total_count/scan_finished 由扫描线程更新，仍需每次读取属性）
+        writer_add = writer.add
+        results_append = indexed_results.append
+        pop_fresh_probe = fresh_probes.pop
+        probe_cache = self.probe_cache
+        ok_count = 0
+        for done, (task, (is_ok, message)) in enumerate(outcomes, 1):
+            idx, file_path, relative_path, file_type, _ = task
+            result = CheckResult(relative_path, file_type, is_ok, message)
             
-            # 输出结果
-            status = "✅ 正常" if is_ok else "❌ 损坏"
-            print(f"     状态: {status} - {message}\n")
+            # 输出结果（缓冲后批量写入）；扫描尚未结束时总数未知
+            total = str(self.total_count) if self.scan_finished else "?"
+            writer_add(done, total, relative_path, result.status, message)
             
-            self.results.append({
-                "path": relative_path,
-                "type": file_type,
-                "status": status,
-                "message": message
-            })
+            results_append((idx, result))
             
+            fresh_probe = pop_fresh_probe(file_path, None)
             if is_ok:
-                self.ok_count += 1
+                ok_count += 1
+                # 仅缓存检测正常的视频，损坏文件下次仍会重新探测
+                if probe_cache is not None and fresh_probe is not None:
+                    probe_cache.put(file_path, fresh_probe)
+        writer.flush()
+        self.ok_count = ok_count
         
+        # 按提交顺序整理结果，保证报告顺序与扫描顺序一致
+        indexed_results.sort(key=lambda item: item[0])
+        self.results = [res for _, res in indexed_results]
         self.error_count = self.total_count - self.ok_count
     
-    def generate_report(self) -> List[str]:
-        """生成检测报告"""
-        report = [
-            "=" * 80,
-            "媒体文件完整性检测报告",
-            "=" * 80,
-            f"检测目录: {self.path}",
-            f"扫描模式: {'递归扫描' if self.recursive else '当前目录'}",
-            f"检测总数: {self.total_count} 个",
-            f"正常文件: {self.ok_count} 个",
-            f"损坏文件: {self.error_count} 个",
-            "\n详细结果:",
-            "-" * 80,
-            f"{'文件路径':<50} {'类型':<8} {'状态':<10} {'说明'}",
-            "-" * 80
-        ]
+    def _iter_tasks(self, batches: Iterable[List[MediaFile]], fresh_probes: Dict[str, Dict]) -> Iterator[Tuple[CheckTask, object]]:
+        """
+        按批生成检测任务及其附加参数（图片为扫描时取得的小写后缀，视频为预探测元数据）
+        :param batches: 媒体文件批次
+        :param fresh_probes: 本次新探测的元数据（输出参数），检测正常后写入缓存
+        :return: (检测任务, 附加参数) 迭代器
+        """
+        dispatch = self.dispatch
+        probe_cache = self.probe_cache
+        idx = 0
+        for batch in batches:
+            tasks = []
+            tasks_append = tasks.append
+            for file_path, relative_path, file_ext in batch:
+                file_type, handler = dispatch[file_ext]
+                tasks_append(((idx, file_path, relative_path, file_type, handler), file_ext))
+                idx += 1
+            
+            # 优先使用缓存，其余视频按批探测，避免逐个文件启动ffprobe
+            # （已安装PyAV时在检测过程中直接读取元数据，无需预先探测）
+            probes: Dict[str, Dict] = {}
+            if av is None:
+                video_paths = [task[1] for task, _ in tasks if task[3] == "VIDEO"]
+                if probe_cache is not None:
+                    for file_path in video_paths:
+                        cached = probe_cache.get(file_path)
+                        if cached is not None:
+                            probes[file_path] = cached
+                batch_probes = probe_videos_batch([p for p in video_paths if p not in probes])
+                probes.update(batch_probes)
+                # 仅成功探测的元数据可写入缓存（失败与超时的文件下次重新探测）
+                fresh_probes.update((path, probe) for path, probe in batch_probes.items() if "duration" in probe)
+            
+            for task, file_ext in tasks:
+                yield task, (file_ext if task[3] == "IMAGE" else probes.get(task[1]))
+    
+    def _iter_outcomes(self, tasks: Iterable[Tuple[CheckTask, object]], workers: int) -> Iterator[Tuple[CheckTask, Tuple[bool, str]]]:
+        """
+        并行执行检测任务，按完成顺序返回结果
+        :param tasks: (检测任务, 附加参数) 迭代器
+        :param workers: 并行工作进程/线程数
+        :return: (检测任务, (是否正常, 检测信息)) 迭代器
+        """
+        if workers <= 1:
+            # 单工作者模式：避免线程池/进程池启动开销
+            for task, extra in tasks:
+                yield task, _check_one(task[4], task[1], extra)
+            return
+        
+        # 线程池重叠磁盘读取与子进程等待（PIL、OpenCV及subprocess在阻塞时均释放GIL）；进程池适用于解码密集的场景
+        if self.io_parallel:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # 流式检测时扫描线程仍在运行，fork出的工作进程可能继承其持有的锁而死锁，因此不使用fork启动
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+        with executor as pool:
+            # 限制同时提交的任务数，使上游（扫描队列）保持背压
+            pending = {}
+            for task, extra in tasks:
+                pending[pool.submit(_check_one, task[4], task[1], extra)] = task
+                if len(pending) >= workers * 2:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        yield pending.pop(future), future.result()
+            for future in as_completed(pending):
+                yield pending[future], future.result()
+    
+    def generate_report(self) -> Iterator[str]:
+        """生成检测报告（逐行返回，避免在内存中构建完整报告）"""
+        yield "=" * 80
+        yield "媒体文件完整性检测报告"
+        yield "=" * 80
+        yield f"检测目录: {self.path}"
+        yield f"扫描模式: {'递归扫描' if self.recursive else '当前目录'}"
+        yield f"检测总数: {self.total_count} 个"
+        yield f"正常文件: {self.ok_count} 个"
+        yield f"损坏文件: {self.error_count} 个"
+        yield "\n详细结果:"
+        yield "-" * 80
+        yield f"{'文件路径':<50} {'类型':<8} {'状态':<10} {'说明'}"
+        yield "-" * 80
         
         for res in self.results:
             # 处理长路径显示
-            display_path = res["path"] if len(res["path"]) <= 50 else "..." + res["path"][-47:]
-            report.append(f"{display_path:<50} {res['type']:<8} {res['status']:<10} {res['message']}")
-        
-        return report
+            display_path = res.path if len(res.path) <= 50 else "..." + res.path[-47:]
+            yield f"{display_path:<50} {res.file_type:<8} {res.status:<10} {res.message}"
     
-    def save_report(self, report: List[str]) -> None:
-        """保存报告到文件"""
+    def save_report(self, report: Optional[Iterable[str]] = None) -> None:
+        """
+        保存报告到文件（逐行写入）
+        :param report: 报告行（可选，默认重新生成完整报告）
+        """
         if self.report_file:
+            if report is None:
+                report = self.generate_report()
             with open(self.report_file, "w", encoding="utf-8") as f:
-                f.write("\n".join(report))
+                f.writelines(line + "\n" for line in report)
             print(f"\n完整报告已保存到: {os.path.abspath(self.report_file)}")
     
     def run(self) -> None:
@@ -228,26 +955,28 @@ class MediaIntegrityChecker:
         # 显示当前处理的是文件还是目录
         if self.is_directory:
             print(f"正在扫描目录: {self.path} {'(递归模式)' if self.recursive else ''}")
+            print("边扫描边检测...\n")
+            self.run_checks_streaming()
         else:
-            print(f"正在检测文件: {self.path}")
-            
-        self.scan_media_files()
+            print(f"正在检测文件: {self.path}\n")
+            self.scan_media_files()
+            self.run_checks()
         
-        if not self.media_files:
+        if not self.total_count:
             print("未发现支持的媒体文件")
             return
         
-        print(f"发现 {self.total_count} 个媒体文件，开始检测...\n")
-        self.run_checks()
+        if self.probe_cache is not None:
+            self.probe_cache.save()
         
         # 生成并显示报告
         report = self.generate_report()
-        print("\n" + "\n".join(report[:8]))  # 显示汇总信息
+        print("\n" + "\n".join(islice(report, REPORT_SUMMARY_LINES)))  # 显示汇总信息
         
         if self.report_file:
-            self.save_report(report)
+            self.save_report()
         else:
-            print("\n".join(report[8:]))  # 显示详细结果
+            sys.stdout.writelines(line + "\n" for line in report)  # 显示详细结果（汇总之后的剩余行）
 
 
 def main():
@@ -269,6 +998,10 @@ def main():
     parser.add_argument("--path", default=".", help="检测目标路径（文件或目录，默认当前目录）")
     parser.add_argument("--recursive", action="store_true", help="目录模式下递归检测子目录")
     parser.add_argument("--report", help="将检测结果保存到指定文件（可选）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用视频探测结果缓存")
+    parser.add_argument("--io-parallel", action="store_true", help="使用线程池并行检测（适用于机械硬盘、网络存储等I/O受限场景）")
+    parser.add_argument("--deep-video", action="store_true", help="深度检测视频：读取全部帧（默认只解码首帧与末尾帧）")
+    parser.add_argument("--strict", action="store_true", help="严格检测图片：总是解析图片数据（默认文件头/尾校验通过即视为正常，不会检出文件中部的损坏数据）")
     args = parser.parse_args()
     
     try:
@@ -276,7 +1009,11 @@ def main():
         checker = MediaIntegrityChecker(
             path=args.path,
             recursive=args.recursive,
-            report_file=args.report
+            report_file=args.report,
+            use_cache=not args.no_cache,
+            io_parallel=args.io_parallel,
+            deep_video=args.deep_video,
+            strict=args.strict
         )
         checker.run()
     except ValueError as e: